@@ -0,0 +1,31 @@
+"""add_task_list_indexes
+
+Revision ID: add_task_list_indexes
+Revises: add_user_job_preferences
+Create Date: 2026-10-16 00:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_task_list_indexes'
+down_revision = 'add_user_job_preferences'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /api/tasks orders by priority DESC, queued_at ASC
+    op.create_index(
+        'idx_tasks_priority_queued',
+        'application_tasks',
+        [sa.text('priority DESC'), 'queued_at'],
+        unique=False,
+    )
+    op.create_index('idx_tasks_job', 'application_tasks', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tasks_job', table_name='application_tasks')
+    op.drop_index('idx_tasks_priority_queued', table_name='application_tasks')
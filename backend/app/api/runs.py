@@ -9,7 +9,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from uuid import UUID
 from datetime import datetime
 import logging
@@ -20,7 +20,7 @@ from app.models.application_task import ApplicationTask
 from app.models.user import User
 from app.services.run_queue import start_next_run, complete_run, get_active_run
 from app.api.auth import get_current_user
-from app.schemas.run import CreateRunRequest, RunResponse, RunListResponse
+from app.schemas.run import CreateRunRequest, RunResponse, RunListResponse, CompleteRunResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -127,24 +127,42 @@ async def get_run_by_id(run_id: str, user_id: str, db: AsyncSession) -> Applicat
     
     return run
 
-async def get_run_with_task_counts(run: ApplicationRun, db: AsyncSession) -> "RunResponse":
+async def get_task_counts(run_ids: list[UUID], db: AsyncSession) -> dict[UUID, dict[str, int]]:
     """
-    Convert an ApplicationRun to RunResponse with task counts.
+    Count tasks by state for several runs in a single query.
     
     Args:
-        run: The ApplicationRun database object
+        run_ids: Run UUIDs
         db: Database session
         
     Returns:
-        RunResponse with all task counts populated
+        Dict of run_id -> {state: count} (empty dict for runs without tasks)
     """
-    # Count tasks by state
-    task_result = await db.execute(
-        select(ApplicationTask)
-        .where(ApplicationTask.run_id == run.id)
+    counts: dict[UUID, dict[str, int]] = {run_id: {} for run_id in run_ids}
+    if not run_ids:
+        return counts
+    
+    result = await db.execute(
+        select(ApplicationTask.run_id, ApplicationTask.state, func.count())
+        .where(ApplicationTask.run_id.in_(run_ids))
+        .group_by(ApplicationTask.run_id, ApplicationTask.state)
     )
-    tasks = task_result.scalars().all()
+    for run_id, state, count in result.all():
+        counts[run_id][state] = count
     
+    return counts
+
+def build_run_response(run: ApplicationRun, state_counts: dict[str, int]) -> RunResponse:
+    """
+    Convert an ApplicationRun and its per-state task counts to a RunResponse.
+    
+    Args:
+        run: The ApplicationRun database object
+        state_counts: {state: count} for the run's tasks (see get_task_counts)
+        
+    Returns:
+        RunResponse with all task counts populated
+    """
     return RunResponse(
         id=str(run.id),
         user_id=str(run.user_id),
@@ -155,14 +173,28 @@ async def get_run_with_task_counts(run: ApplicationRun, db: AsyncSession) -> "Ru
         started_at=run.started_at,
         completed_at=run.completed_at,
         updated_at=run.updated_at,
-        total_tasks=len(tasks),
-        queued_tasks=sum(1 for t in tasks if t.state == "QUEUED"),
-        running_tasks=sum(1 for t in tasks if t.state == "RUNNING"),
-        submitted_tasks=sum(1 for t in tasks if t.state == "SUBMITTED"),
-        failed_tasks=sum(1 for t in tasks if t.state == "FAILED"),
-        rejected_tasks=sum(1 for t in tasks if t.state == "REJECTED"),
+        total_tasks=sum(state_counts.values()),
+        queued_tasks=state_counts.get("QUEUED", 0),
+        running_tasks=state_counts.get("RUNNING", 0),
+        submitted_tasks=state_counts.get("SUBMITTED", 0),
+        failed_tasks=state_counts.get("FAILED", 0),
+        rejected_tasks=state_counts.get("REJECTED", 0),
     )
 
+async def get_run_with_task_counts(run: ApplicationRun, db: AsyncSession) -> "RunResponse":
+    """
+    Convert an ApplicationRun to RunResponse with task counts.
+    
+    Args:
+        run: The ApplicationRun database object
+        db: Database session
+        
+    Returns:
+        RunResponse with all task counts populated
+    """
+    counts = await get_task_counts([run.id], db)
+    return build_run_response(run, counts[run.id])
+
 # Endpoints
 @router.post("/", response_model=RunResponse, status_code=201)
 async def create_run(
@@ -255,11 +287,9 @@ async def list_runs(
         )
         runs = result.scalars().all()
         
-        # Get task counts for each run using helper function
-        run_responses = []
-        for run in runs:
-            run_response = await get_run_with_task_counts(run, db)
-            run_responses.append(run_response)
+        # Get task counts for all runs in one query (not one per run)
+        counts = await get_task_counts([run.id for run in runs], db)
+        run_responses = [build_run_response(run, counts[run.id]) for run in runs]
         
         return RunListResponse(
             runs=run_responses,
@@ -395,7 +425,7 @@ async def start_run(
         )
 
 
-@router.post("/{run_id}/complete", response_model=RunResponse)
+@router.post("/{run_id}/complete", response_model=CompleteRunResponse)
 async def mark_run_complete(
     run_id: str,
     auto_start_next: bool = True,
@@ -405,6 +435,9 @@ async def mark_run_complete(
     """
     Mark a run as completed and optionally start the next queued run.
     
+    The response is the completed run; next_run holds the run that was
+    auto-started (or null), so clients don't need a second request.
+    
     Args:
         run_id: Run UUID
         auto_start_next: If True, automatically start next queued run (default: True)
@@ -417,9 +450,17 @@ async def mark_run_complete(
         # Mark as completed (and optionally start next run)
         next_run = await complete_run(db, run_id, auto_start_next=auto_start_next)
         
-        # Return the completed run
+        # Return the completed run along with the auto-started one
         await db.refresh(run)
-        return await get_run_with_task_counts(run, db)
+        # One grouped count query covers both runs
+        run_ids = [run.id] + ([next_run.id] if next_run else [])
+        counts = await get_task_counts(run_ids, db)
+        run_response = build_run_response(run, counts[run.id])
+        next_run_response = build_run_response(next_run, counts[next_run.id]) if next_run else None
+        return CompleteRunResponse(
+            **run_response.model_dump(),
+            next_run=next_run_response,
+        )
     
     except HTTPException:
         raise
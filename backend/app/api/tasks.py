@@ -8,6 +8,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.orm import raiseload
 import logging
 
 from app.database import get_db
@@ -42,8 +43,9 @@ async def list_tasks(
     
     Returns tasks ordered by priority DESC, queued_at ASC (queue order).
     """
-    # Build query with filters
-    query = select(ApplicationTask)
+    # Build query with filters (TaskResponse has no relationships; raiseload
+    # turns any accidental per-row lazy load into an error instead of N+1)
+    query = select(ApplicationTask).options(raiseload("*"))
     filters = []
     
     if run_id:
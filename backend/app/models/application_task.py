@@ -56,4 +56,10 @@ class ApplicationTask(Base):
         
         # Index for efficient queue dequeue
         Index('idx_tasks_queue', 'run_id', 'state', 'priority', 'queued_at'),
+        
+        # Index for the task list's queue order when no run is given
+        Index('idx_tasks_priority_queued', priority.desc(), queued_at),
+        
+        # Index for job_id filters without a run (uq_run_job needs run_id first)
+        Index('idx_tasks_job', 'job_id'),
     )
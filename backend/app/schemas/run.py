@@ -33,6 +33,11 @@ class RunResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CompleteRunResponse(RunResponse):
+    """Completed run, plus the queued run that was auto-started (if any)."""
+    next_run: Optional[RunResponse] = None
+
+
 class RunListResponse(BaseModel):
     """List of runs."""
     runs: list[RunResponse]
@@ -48,7 +48,8 @@ async def transition_task(
     task_id: str,
     from_state: Optional[TaskState],
     to_state: TaskState,
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
 ) -> ApplicationTask:
     """
     Transition a task to a new state with validation.
@@ -59,6 +60,8 @@ async def transition_task(
         from_state: Expected current state (for optimistic locking). None means skip validation (initial state).
         to_state: Target state
         metadata: Optional metadata about the transition (error info, etc.)
+        commit: Commit after the transition (default). With False the change is
+            only flushed, so several transitions can share one commit.
     
     Returns:
         Updated ApplicationTask
@@ -138,7 +141,10 @@ async def transition_task(
     if to_state == TaskState.SUBMITTED:
         await _mark_job_as_applied(db, task.job_id)
     
-    await db.commit()
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
     await db.refresh(task)
     
     # Log transition with metadata
@@ -1,40 +1,67 @@
 """
 Pytest fixtures for testing.
 """
+import asyncio
+import os
 import pytest
 import pytest_asyncio
+from pytest_asyncio import is_async_test
 import tempfile
 from pathlib import Path
-from typing import AsyncGenerator
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Generator
+from uuid import uuid4
 
+# app.config reads required settings at import time. Give the test session its
+# own defaults so plain `pytest` works without a .env or exported variables;
+# the app's engine is never used for test data (get_db is overridden below).
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///file:app?mode=memory&cache=shared&uri=true")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-# Import database module BEFORE app to allow override
-import app.database
 from app.database import Base, get_db
-import app.services.resume
+from app.services import resume as resume_service
 # Import ALL models so Base.metadata knows about all tables
 from app.models.user import User
 from app.models.application_run import ApplicationRun
 from app.models.application_task import ApplicationTask
 from app.models.approval_request import ApprovalRequest
 from app.models.job_posting import JobPosting
+from app.schemas.run import RunListResponse, RunResponse
 
-# Now import app (after we can override database)
+# Imported once per session; get_db is overridden once (see app fixture)
 from app.main import app as fastapi_app
+from tests.helpers.asgi import CallApi, call_asgi, cookie_header
+from tests.helpers.endpoints import ApiRaw, call_endpoint
+from tests.helpers.factories import UserWithRun, insert_user_with_run
+
 
+# Test database URL template (in-memory SQLite for fast tests).
+# A named in-memory DB per pytest-xdist worker keeps parallel workers isolated.
+TEST_DATABASE_URL = "sqlite+aiosqlite:///file:test_{worker_id}?mode=memory&cache=shared&uri=true"
 
-# Test database URL (use in-memory SQLite for fast tests)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Connection PRAGMAs for the test engine (durability is irrelevant in tests)
+SQLITE_TEST_PRAGMAS = (
+    "synchronous=OFF",
+    "journal_mode=MEMORY",
+    "temp_store=MEMORY",
+    "locking_mode=EXCLUSIVE",
+    # SQLite's usual default, pinned for builds compiled with FKs on: tests
+    # insert tasks for job_ids with no job row, and skip the per-insert FK lookups
+    "foreign_keys=OFF",
+)
 
 # Test sample files directory
 SAMPLES_DIR = Path(__file__).parent / "samples"
 
 # Override resume directory for tests
 TEST_RESUME_DIR = Path(tempfile.gettempdir()) / "test_resumes"
-app.services.resume.RESUME_DIR = TEST_RESUME_DIR
+resume_service.RESUME_DIR = TEST_RESUME_DIR
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -53,87 +80,182 @@ def cleanup_test_resumes():
         shutil.rmtree(TEST_RESUME_DIR)
 
 
-@pytest_asyncio.fixture
-async def db() -> AsyncGenerator[AsyncSession, None]:
+def pytest_collection_modifyitems(items):
+    """
+    Run every async test on ONE session-wide event loop.
+    
+    Async fixtures default to the session loop too (see pytest.ini), so
+    the session engine, shared client and per-test fixtures all live on
+    the same loop instead of a new loop being built and torn down per test.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
     """
-    Create a fresh database for each test.
-    Ensures cleanup happens even if test fails.
+    Run async tests on uvloop when available (it is not supported on Windows).
+    
+    Every test awaits dozens of httpx/aiosqlite calls, so loop dispatch
+    overhead adds up; uvloop roughly halves it.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def test_database_url(worker_id: str) -> str:
+    """
+    In-memory database URL for this pytest-xdist worker.
+    
+    worker_id is "gw0", "gw1", ... under `pytest -n auto` and "master"
+    when running serially.
+    """
+    return TEST_DATABASE_URL.format(worker_id=worker_id)
+
+
+# Session the get_db override hands to endpoints; the db fixture sets it
+# for the duration of each test. (Not a ContextVar: async fixtures and
+# the test body run in different tasks, so a value set in the fixture
+# would not be visible to requests made by the test.)
+_active_db: dict[str, AsyncSession] = {}
+
+
+async def _get_test_db() -> AsyncGenerator[AsyncSession, None]:
+    """get_db override: the current test's session, else the real get_db."""
+    session = _active_db.get("session")
+    if session is None:
+        async for session in get_db():
+            yield session
+    else:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def app() -> Generator[FastAPI, None, None]:
+    """
+    FastAPI application shared by the whole test session.
+    
+    Routes and response models are built once at import, and get_db is
+    overridden once here; per test only the session behind the override
+    changes (see db fixture).
+    """
+    fastapi_app.dependency_overrides[get_db] = _get_test_db
+    yield fastapi_app
+    fastapi_app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def engine(test_database_url: str) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Test engine with the schema created ONCE per session.
+    
+    Tests never commit for real: the db fixture wraps each test in a
+    transaction that is rolled back on teardown.
     """
-    # Create async engine for test database
     # Use StaticPool to keep single connection alive and reuse it
-    # This ensures all sessions see the same in-memory database
+    # This ensures all sessions see the same in-memory database, and that
+    # every statement (test setup and endpoint alike) runs on the one
+    # aiosqlite worker thread behind that connection
     test_engine = create_async_engine(
-        TEST_DATABASE_URL,
+        test_database_url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
     
-    # Create all tables FIRST
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    # Verify: StaticPool reuses a single connection for all operations
-    # This ensures only ONE in-memory database exists per test
-    assert isinstance(test_engine.pool, StaticPool), f"Expected StaticPool, got {type(test_engine.pool)}"
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Tests never need durability: skip fsync and the on-disk rollback journal
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_TEST_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+        # pysqlite's own transaction handling breaks SAVEPOINTs;
+        # disable it and emit BEGIN ourselves (see _on_begin)
+        dbapi_connection.isolation_level = None
     
-    # THEN replace the app's engine and sessionmaker
-    # This ensures get_db() uses sessions connected to DB with tables
-    original_engine = app.database.engine
-    original_sessionmaker = app.database.AsyncSessionLocal
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
     
-    app.database.engine = test_engine
-    app.database.AsyncSessionLocal = async_sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    
-    # Create session for direct test use
-    async_session = async_sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    
-    session = async_session()
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     
     try:
-        yield session
+        yield test_engine
     finally:
-        # Cleanup strategy: Try each step independently
-        # For in-memory DB, engine.dispose() is the ultimate cleanup
-        
-        # Step 1: Close session
-        try:
-            await session.close()
-        except Exception as e:
-            print(f"Warning: Failed to close session: {e}")
+        async with test_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await test_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(app: FastAPI, engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Database session for one test, rolled back on teardown.
+    
+    The session is bound to a connection with an outer transaction open;
+    with join_transaction_mode="create_savepoint", commit()/rollback()
+    inside the test (or an endpoint) only release/roll back a SAVEPOINT,
+    so every test still starts from the empty schema.
+    """
+    async with engine.connect() as conn:
+        outer_transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
         
-        # Step 2: Drop tables (best effort)
-        try:
-            async with test_engine.begin() as conn:
-                await conn.run_sync(Base.metadata.drop_all)
-        except Exception as e:
-            print(f"Warning: Failed to drop tables: {e}")
-            print("In-memory DB will be destroyed on engine disposal")
+        # Point the app's get_db override at the test's own session
+        # Endpoints share it with the test, so setup data only needs a flush()
+        # (not a commit) to be visible to the API call
+        _active_db["session"] = session
         
-        # Step 3: Dispose test engine
         try:
-            await test_engine.dispose()
-        except Exception as e:
-            print(f"Warning: Failed to dispose engine: {e}")
-            # At this point, rely on Python's garbage collector
-        
-        # Step 4: Restore original engine
-        app.database.engine = original_engine
-        app.database.AsyncSessionLocal = original_sessionmaker
+            yield session
+        finally:
+            _active_db.pop("session", None)
+            await session.close()
+            await outer_transaction.rollback()
 
 
-@pytest_asyncio.fixture
-async def async_client(db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+@pytest.fixture
+def count_queries(engine: AsyncEngine) -> Generator[list[str], None, None]:
+    """
+    Record every SELECT sent to the test database during the test.
+
+    Tests compare len() of the list (clear() it between phases) to catch
+    N+1 patterns; SAVEPOINT/INSERT traffic is ignored.
+    """
+    statements: list[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
     """
-    Create an async HTTP client for testing endpoints.
+    The one HTTP client (and ASGI transport) reused by the whole session.
     
-    The db fixture already replaced app.database.engine with test engine,
-    so all endpoints will automatically use the test database.
+    Use async_client/client rather than this one: they reset cookies and
+    depend on db, so the get_db override is in place for each test.
     """
-    transport = ASGITransport(app=fastapi_app)
+    transport = ASGITransport(app=app)
     
     async with AsyncClient(
         transport=transport,
@@ -143,6 +265,52 @@ async def async_client(db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield client
 
 
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _warmup(shared_client: AsyncClient) -> None:
+    """
+    Make one throwaway request to each runs endpoint before the first test.
+    
+    Starlette builds the middleware stack and FastAPI resolves the route
+    dependencies lazily on the first request, so without this the first
+    test that hits the API pays that one-time cost. The requests carry no
+    auth cookie and are rejected with 401 before touching the database.
+    
+    Pydantic v2 compiles the response models' core schemas at import, so
+    there is nothing to rebuild; one validate + serialize round-trip of
+    the runs response models covers their remaining first-use paths.
+    """
+    fake = uuid4()
+    await shared_client.get("/api/runs")
+    await shared_client.get(f"/api/runs/{fake}")
+    
+    now = datetime.now(timezone.utc)
+    run = RunResponse.model_validate({
+        "id": str(fake),
+        "user_id": str(fake),
+        "name": None,
+        "description": None,
+        "status": "queued",
+        "created_at": now,
+        "started_at": None,
+        "completed_at": None,
+        "updated_at": now,
+    })
+    RunListResponse(runs=[run], total=1).model_dump_json()
+
+
+@pytest_asyncio.fixture
+async def async_client(shared_client: AsyncClient, db: AsyncSession) -> AsyncClient:
+    """
+    Unauthenticated async HTTP client for testing endpoints.
+    
+    The db fixture already overrode get_db with the test engine,
+    so all endpoints will automatically use the test database.
+    """
+    # Drop cookies left by the previous test (auth cookie, login/logout responses)
+    shared_client.cookies.clear()
+    return shared_client
+
+
 @pytest.fixture
 def sample_resume_pdf() -> Path:
     """Return path to sample PDF resume."""
@@ -161,34 +329,48 @@ def sample_resume_docx() -> Path:
     return SAMPLES_DIR / "sample_resume.docx"
 
 
-@pytest_asyncio.fixture
-async def test_user(db: AsyncSession) -> User:
+@pytest_asyncio.fixture(scope="session")
+async def test_user(engine: AsyncEngine) -> User:
     """
     Create a test user with complete profile for tests that need authentication.
+    
+    Created ONCE per session and committed outside the per-test transaction,
+    so it survives every db rollback. Anything a test changes on this user
+    through the db session is rolled back with the test.
     """
-    # Copy the actual resume to test directory
-    import shutil
-    test_resume_path = TEST_RESUME_DIR / "test_user" / "AlexanderFarhoodResumeDevOps.pdf"
-    test_resume_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy(SAMPLES_DIR / "AlexanderFarhoodResumeDevOps.pdf", test_resume_path)
+    resume_path = SAMPLES_DIR / "AlexanderFarhoodResumeDevOps.pdf"
+    resume_data = resume_path.read_bytes()
     
     user = User(
         email="testuser@example.com",
         full_name="Test User",
         phone="555-0100",
-        resume_path=str(test_resume_path),
+        resume_data=resume_data,
+        resume_filename=resume_path.name,
+        resume_size_bytes=len(resume_data),
         mandatory_questions={
             "work_authorization": "yes",
             "veteran_status": "no",
             "disability_status": "no"
         }
     )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(user)
+        await session.commit()
     return user
 
 
+@pytest_asyncio.fixture
+async def other_user_with_run(db: AsyncSession) -> UserWithRun:
+    """
+    A second user ("other@example.com") owning one queued run.
+    
+    For ownership and isolation tests. Tests that only sometimes need it
+    (e.g. one parametrized case) can call insert_user_with_run() directly.
+    """
+    return await insert_user_with_run(db)
+
+
 @pytest_asyncio.fixture
 async def client(async_client: AsyncClient, test_user: User) -> AsyncClient:
     """
@@ -200,3 +382,44 @@ async def client(async_client: AsyncClient, test_user: User) -> AsyncClient:
     # Set auth cookie on client
     async_client.cookies.set("auth_token", str(test_user.id))
     return async_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(test_user: User) -> list[tuple[bytes, bytes]]:
+    """
+    Raw ASGI auth header for test_user, encoded once per session.
+    
+    Phase 1: the auth cookie is just the user_id (no JWT to sign yet).
+    """
+    return [cookie_header({"auth_token": str(test_user.id)})]
+
+
+@pytest.fixture
+def call_api(app: FastAPI, db: AsyncSession, auth_headers: list[tuple[bytes, bytes]]) -> CallApi:
+    """
+    Authenticated direct-ASGI caller: call_api(method, path, json=None, content=None, params=None).
+    
+    Lighter than the httpx client for plain JSON endpoints; requests are
+    sent as test_user and share the db fixture's session.
+    """
+    async def _call_api(method: str, path: str, json=None, content=None, params=None):
+        return await call_asgi(
+            app, method, path, json=json, content=content, headers=auth_headers, params=params
+        )
+    
+    return _call_api
+
+
+@pytest.fixture
+def api_raw(app: FastAPI, db: AsyncSession, test_user: User) -> ApiRaw:
+    """
+    Call an endpoint function directly as test_user: api_raw(endpoint, **params).
+    
+    For tests that only check the returned data: skips routing and the JSON
+    round trip and returns the route's response_model instance(s). Use
+    call_api for status codes and query validation.
+    """
+    async def _api_raw(endpoint, **params):
+        return await call_endpoint(app, endpoint, db=db, current_user=test_user, **params)
+    
+    return _api_raw
@@ -0,0 +1,119 @@
+"""
+Direct ASGI calls for endpoint tests.
+
+httpx's AsyncClient + ASGITransport parses URLs, keeps a cookie jar,
+normalizes headers and streams bodies on every request, which costs more
+than most of our endpoints do. call_asgi() builds the ASGI scope by hand
+and runs the app coroutine directly, collecting the response.
+
+Note: redirects are NOT followed, so use the canonical route paths
+(e.g. "/api/runs/" rather than "/api/runs").
+"""
+import json as jsonlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlencode
+
+from fastapi import FastAPI
+
+
+@dataclass
+class ApiResponse:
+    """Status code and raw body of a direct ASGI call."""
+    status_code: int
+    body: bytes
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.body)
+
+
+# Signature of the call_api fixture: call_api(method, path, json=None, content=None, params=None)
+CallApi = Callable[..., Awaitable[ApiResponse]]
+
+
+def json_body(data: Any) -> bytes:
+    """Encode a request body the way call_asgi() sends it."""
+    return jsonlib.dumps(data).encode()
+
+
+def cookie_header(cookies: dict[str, str]) -> tuple[bytes, bytes]:
+    """Encode cookies as a raw ASGI Cookie header (build once, reuse per request)."""
+    header = "; ".join(f"{name}={value}" for name, value in cookies.items())
+    return (b"cookie", header.encode())
+
+
+async def call_asgi(
+    app: FastAPI,
+    method: str,
+    path: str,
+    json: Optional[Any] = None,
+    content: Optional[bytes] = None,
+    headers: Optional[list[tuple[bytes, bytes]]] = None,
+    params: Optional[dict[str, Any]] = None,
+) -> ApiResponse:
+    """
+    Send one HTTP request straight to the ASGI app.
+    
+    Args:
+        app: ASGI application under test
+        method: HTTP method ("GET", "POST", ...)
+        path: Request path, optionally with a "?query" string
+        json: JSON-serializable request body
+        content: Pre-encoded JSON body (takes precedence over json);
+            encode constant bodies once at module level with json_body()
+        headers: Extra raw ASGI headers, e.g. from cookie_header()
+        params: Query parameters, encoded straight into the query string
+            (appended to any "?query" already in path)
+        
+    Returns:
+        ApiResponse with the status code and body
+    """
+    path, _, query = path.partition("?")
+    if params:
+        query = f"{query}&{urlencode(params)}" if query else urlencode(params)
+    if content is not None:
+        body = content
+    elif json is not None:
+        body = json_body(json)
+    else:
+        body = b""
+    request_headers = [(b"host", b"test"), (b"content-type", b"application/json")]
+    if headers:
+        request_headers.extend(headers)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": request_headers,
+        "client": ("testclient", 50000),
+        "server": ("test", 80),
+    }
+
+    request_sent = False
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status_code = 500
+    chunks = []
+
+    async def send(message: dict) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return ApiResponse(status_code=status_code, body=b"".join(chunks))
@@ -0,0 +1,39 @@
+"""
+Query helpers for test assertions.
+"""
+from typing import Any, Iterable, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+async def reload_many(
+    db: AsyncSession,
+    model: type[ModelT],
+    ids: Iterable[Any],
+) -> dict[Any, ModelT]:
+    """
+    Re-read several rows of one model in a single SELECT.
+
+    Replaces a chain of db.refresh() calls after an API request has changed
+    the rows. populate_existing makes objects already in the identity map
+    pick up the new column values, like refresh() would.
+
+    Args:
+        db: Test database session
+        model: Mapped class with an ``id`` primary key
+        ids: Primary keys to load
+
+    Returns:
+        Dict of id -> instance (missing ids are simply absent)
+    """
+    result = await db.execute(
+        select(model)
+        .where(model.id.in_(list(ids)))
+        .execution_options(populate_existing=True)
+    )
+    return {row.id: row for row in result.scalars().all()}
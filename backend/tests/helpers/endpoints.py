@@ -0,0 +1,72 @@
+"""
+Direct endpoint calls for structure-only tests.
+
+call_asgi() still encodes the response to JSON and the test decodes it
+again with .json(). When a test only checks which rows come back (not
+status codes or the wire format), call_endpoint() awaits the route
+function itself and validates its return value against the route's
+response_model, so the test gets Pydantic models with no JSON round trip.
+
+Note: FastAPI's request handling is skipped entirely, so query parameter
+validation (ge/le, types) and dependencies are NOT applied; use call_api
+for those contract checks.
+"""
+import inspect
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+from fastapi import FastAPI
+from fastapi.params import Depends
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+
+
+# Signature of the api_raw fixture: api_raw(endpoint, **params)
+ApiRaw = Callable[..., Awaitable[Any]]
+
+
+@lru_cache(maxsize=None)
+def _response_adapter(app: FastAPI, endpoint: Callable) -> TypeAdapter:
+    """TypeAdapter for the response_model of the route serving endpoint."""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.endpoint is endpoint:
+            return TypeAdapter(route.response_model)
+    raise LookupError(f"No route is served by {endpoint.__qualname__}")
+
+
+def _with_query_defaults(endpoint: Callable, params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Fill in the defaults of Query()/Path() parameters that weren't passed.
+
+    Called directly, such parameters would otherwise receive the Query
+    object itself as their value.
+    """
+    kwargs = dict(params)
+    for name, parameter in inspect.signature(endpoint).parameters.items():
+        default = parameter.default
+        if name in kwargs or isinstance(default, Depends):
+            continue
+        if isinstance(default, FieldInfo):
+            if default.default is PydanticUndefined:
+                raise TypeError(f"{endpoint.__qualname__}() missing parameter {name!r}")
+            kwargs[name] = default.default
+    return kwargs
+
+
+async def call_endpoint(app: FastAPI, endpoint: Callable, **params: Any) -> Any:
+    """
+    Await an endpoint function and validate its result like FastAPI would.
+
+    Args:
+        app: Application whose routes include endpoint
+        endpoint: Route function, e.g. app.api.tasks.list_tasks
+        **params: Arguments for the endpoint, including its dependencies
+            (db, current_user); omitted query parameters take their defaults
+
+    Returns:
+        The endpoint's response_model instance(s)
+    """
+    result = await endpoint(**_with_query_defaults(endpoint, params))
+    return _response_adapter(app, endpoint).validate_python(result, from_attributes=True)
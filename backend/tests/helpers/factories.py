@@ -0,0 +1,52 @@
+"""
+Row factories for test setup.
+
+These use Core INSERT ... RETURNING on the test's session instead of
+building ORM objects and flushing, so each row is one round-trip and
+nothing lands in the identity map.
+"""
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application_run import ApplicationRun
+from app.models.user import User
+
+
+class UserWithRun(NamedTuple):
+    """IDs of a user and the run created for it."""
+    user_id: UUID
+    run_id: UUID
+
+
+async def insert_user_with_run(
+    db: AsyncSession,
+    email: str = "other@example.com",
+    run_name: str = "Other Run",
+    run_status: str = "queued",
+) -> UserWithRun:
+    """
+    Insert a user and one run owned by it (no interim flush).
+    
+    Args:
+        db: Test database session
+        email: Email for the new user
+        run_name: Name of the user's run
+        run_status: Status of the user's run
+        
+    Returns:
+        UserWithRun with the new user and run IDs
+    """
+    user_id = (
+        await db.execute(insert(User).values(email=email).returning(User.id))
+    ).scalar_one()
+    run_id = (
+        await db.execute(
+            insert(ApplicationRun)
+            .values(user_id=user_id, name=run_name, status=run_status)
+            .returning(ApplicationRun.id)
+        )
+    ).scalar_one()
+    return UserWithRun(user_id=user_id, run_id=run_id)
@@ -0,0 +1,47 @@
+"""
+State machine helpers for tests.
+"""
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application_task import ApplicationTask, TaskState
+from app.services.state_machine import transition_task
+
+
+async def drive_task(
+    db: AsyncSession,
+    task_id: UUID,
+    states: Iterable[TaskState],
+    metadata: Optional[dict] = None,
+) -> ApplicationTask:
+    """
+    Walk a task through a sequence of states to set up a test.
+    
+    Each hop goes through transition_task (so it is validated exactly like
+    production code) without checking from_state. Only the last hop commits;
+    the earlier ones are just flushed.
+    
+    Args:
+        db: Test database session
+        task_id: Task to move
+        states: States to transition to, in order
+        metadata: Optional metadata for the LAST transition only
+        
+    Returns:
+        The task after the last transition
+    """
+    states = list(states)
+    task = None
+    for i, state in enumerate(states):
+        last = i == len(states) - 1
+        task = await transition_task(
+            db,
+            str(task_id),
+            None,
+            state,
+            metadata=metadata if last else None,
+            commit=last,
+        )
+    return task
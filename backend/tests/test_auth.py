@@ -5,8 +5,10 @@ This test suite validates the magic link authentication flow:
 1. Requesting a magic link (creates or updates user with token)
 2. Verifying the token (authenticates user and clears token for one-time use)
 
-The fixtures (async_client, db) handle all cleanup automatically via try/finally blocks.
-Each test gets a fresh in-memory SQLite database that's destroyed after the test.
+The schema is created once per test session. Each test runs inside an
+outer transaction that the db fixture rolls back afterwards (commits in the
+test or an endpoint only release a SAVEPOINT), so no test sees another
+test's rows.
 """
 import pytest
 from datetime import datetime, timedelta
@@ -36,34 +38,27 @@ async def test_request_magic_link_new_user(async_client: AsyncClient, db: AsyncS
     - API returns correct email and success message
     - User record is created in database
     - Token and expiry are set
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Make API request to create magic link
-        response = await async_client.post(
-            "/api/auth/request-magic-link",
-            json={"email": "newuser@example.com"}
-        )
-        
-        # Verify API response
-        assert response.status_code == 200
-        data = response.json()
-        assert data["email"] == "newuser@example.com"
-        assert "Magic link sent" in data["message"]
-        
-        # Verify database state: user was created with token
-        result = await db.execute(
-            select(User).where(User.email == "newuser@example.com")
-        )
-        user = result.scalar_one_or_none()
-        assert user is not None, "User should be created in database"
-        assert user.magic_link_token is not None, "Token should be generated"
-        assert user.magic_link_expires_at is not None, "Expiry should be set"
-        
-    except Exception as e:
-        # If test fails, fixture still cleans up DB
-        raise e
+    # Make API request to create magic link
+    response = await async_client.post(
+        "/api/auth/request-magic-link",
+        json={"email": "newuser@example.com"}
+    )
+    
+    # Verify API response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email"] == "newuser@example.com"
+    assert "Magic link sent" in data["message"]
+    
+    # Verify database state: user was created with token
+    result = await db.execute(
+        select(User).where(User.email == "newuser@example.com")
+    )
+    user = result.scalar_one_or_none()
+    assert user is not None, "User should be created in database"
+    assert user.magic_link_token is not None, "Token should be generated"
+    assert user.magic_link_expires_at is not None, "Expiry should be set"
 
 
 @pytest.mark.asyncio
@@ -82,36 +77,30 @@ async def test_request_magic_link_existing_user(async_client: AsyncClient, db: A
     - No duplicate users created (still only 1 user with that email)
     - Same user ID (proves it's an update, not a new user)
     - Token is updated (not None)
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Setup: Create existing user in database
-        user = User(email="existing@example.com")
-        db.add(user)
-        await db.commit()
-        old_id = user.id  # Save ID to verify no duplication
-        
-        # Make API request for same email
-        response = await async_client.post(
-            "/api/auth/request-magic-link",
-            json={"email": "existing@example.com"}
-        )
-        
-        # Verify API response
-        assert response.status_code == 200
-        
-        # Verify database state: user updated, not duplicated
-        result = await db.execute(
-            select(User).where(User.email == "existing@example.com")
-        )
-        users = result.scalars().all()
-        assert len(users) == 1, "Should not create duplicate user"
-        assert users[0].id == old_id, "Should update existing user, not create new one"
-        assert users[0].magic_link_token is not None, "Token should be updated"
-        
-    except Exception as e:
-        raise e
+    # Setup: Create existing user in database
+    user = User(email="existing@example.com")
+    db.add(user)
+    await db.commit()
+    old_id = user.id  # Save ID to verify no duplication
+    
+    # Make API request for same email
+    response = await async_client.post(
+        "/api/auth/request-magic-link",
+        json={"email": "existing@example.com"}
+    )
+    
+    # Verify API response
+    assert response.status_code == 200
+    
+    # Verify database state: user updated, not duplicated
+    result = await db.execute(
+        select(User).where(User.email == "existing@example.com")
+    )
+    users = result.scalars().all()
+    assert len(users) == 1, "Should not create duplicate user"
+    assert users[0].id == old_id, "Should update existing user, not create new one"
+    assert users[0].magic_link_token is not None, "Token should be updated"
 
 
 @pytest.mark.asyncio
@@ -133,46 +122,38 @@ async def test_verify_token_valid(async_client: AsyncClient, db: AsyncSession):
     - Expiry is also cleared
     
     This implements one-time use security: token is destroyed after first use.
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Setup: Create user with valid (non-expired) token
-        user = User(email="test@example.com")
-        user.magic_link_token = uuid4().hex
-        user.magic_link_expires_at = datetime.utcnow() + timedelta(minutes=30)
-        db.add(user)
-        await db.commit()
-        saved_token = user.magic_link_token
-        
-        # Make API request to verify token
-        response = await async_client.post(
-            "/api/auth/verify-token",
-            json={"token": saved_token}
-        )
-        
-        # Verify API response
-        assert response.status_code == 200
-        data = response.json()
-        assert data["email"] == "test@example.com"
-        assert data["user_id"] == str(user.id)
-        assert data["access_token"] is not None, "Should return session token"
-        # Phase 1: access_token is user_id (will be JWT in Phase 2)
-        assert data["access_token"] == str(user.id), "Session token should match user_id"
-        
-        # Verify cookie is set for httpOnly authentication
-        assert "auth_token" in response.cookies, "Should set auth_token cookie"
-        assert response.cookies["auth_token"] == str(user.id), "Cookie should contain user_id"
-        
-        # Verify database state: magic link token cleared (one-time use)
-        await db.refresh(user)
-        assert user.magic_link_token is None, "Magic link token should be cleared after use"
-        assert user.magic_link_expires_at is None, "Expiry should be cleared"
-        
-    except Exception as e:
-        raise e
-    finally:
-        pass
+    # Setup: Create user with valid (non-expired) token
+    user = User(email="test@example.com")
+    user.magic_link_token = uuid4().hex
+    user.magic_link_expires_at = datetime.utcnow() + timedelta(minutes=30)
+    db.add(user)
+    await db.commit()
+    saved_token = user.magic_link_token
+    
+    # Make API request to verify token
+    response = await async_client.post(
+        "/api/auth/verify-token",
+        json={"token": saved_token}
+    )
+    
+    # Verify API response
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email"] == "test@example.com"
+    assert data["user_id"] == str(user.id)
+    assert data["access_token"] is not None, "Should return session token"
+    # Phase 1: access_token is user_id (will be JWT in Phase 2)
+    assert data["access_token"] == str(user.id), "Session token should match user_id"
+    
+    # Verify cookie is set for httpOnly authentication
+    assert "auth_token" in response.cookies, "Should set auth_token cookie"
+    assert response.cookies["auth_token"] == str(user.id), "Cookie should contain user_id"
+    
+    # Verify database state: magic link token cleared (one-time use)
+    await db.refresh(user)
+    assert user.magic_link_token is None, "Magic link token should be cleared after use"
+    assert user.magic_link_expires_at is None, "Expiry should be cleared"
 
 
 @pytest.mark.asyncio
@@ -192,22 +173,16 @@ async def test_verify_token_invalid_empty_db(async_client: AsyncClient):
     - Error message mentions "Invalid token"
     
     Security: Prevents brute force attacks (would need to guess valid token).
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Make API request with fake token (DB is empty)
-        response = await async_client.post(
-            "/api/auth/verify-token",
-            json={"token": "invalid-token-12345"}
-        )
-        
-        # Verify rejection
-        assert response.status_code == 401, "Should reject invalid token"
-        assert "Invalid token" in response.json()["detail"]
-        
-    except Exception as e:
-        raise e
+    # Make API request with fake token (DB is empty)
+    response = await async_client.post(
+        "/api/auth/verify-token",
+        json={"token": "invalid-token-12345"}
+    )
+    
+    # Verify rejection
+    assert response.status_code == 401, "Should reject invalid token"
+    assert "Invalid token" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
@@ -227,34 +202,28 @@ async def test_verify_token_invalid_with_users(async_client: AsyncClient, db: As
     - Error message mentions "Invalid token"
     
     Security: Token must exactly match - can't use another user's token or random token.
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Setup: Create users with their own valid tokens
-        user1 = User(email="user1@example.com")
-        user1.magic_link_token = uuid4().hex
-        user1.magic_link_expires_at = datetime.utcnow() + timedelta(minutes=30)
-        
-        user2 = User(email="user2@example.com")
-        user2.magic_link_token = uuid4().hex
-        user2.magic_link_expires_at = datetime.utcnow() + timedelta(minutes=30)
-        
-        db.add_all([user1, user2])
-        await db.commit()
-        
-        # Make API request with token that doesn't match either user
-        response = await async_client.post(
-            "/api/auth/verify-token",
-            json={"token": "completely-different-token-12345"}
-        )
-        
-        # Verify rejection
-        assert response.status_code == 401, "Should reject invalid token"
-        assert "Invalid token" in response.json()["detail"]
-        
-    except Exception as e:
-        raise e
+    # Setup: Create users with their own valid tokens
+    user1 = User(email="user1@example.com")
+    user1.magic_link_token = uuid4().hex
+    user1.magic_link_expires_at = datetime.utcnow() + timedelta(minutes=30)
+    
+    user2 = User(email="user2@example.com")
+    user2.magic_link_token = uuid4().hex
+    user2.magic_link_expires_at = datetime.utcnow() + timedelta(minutes=30)
+    
+    db.add_all([user1, user2])
+    await db.commit()
+    
+    # Make API request with token that doesn't match either user
+    response = await async_client.post(
+        "/api/auth/verify-token",
+        json={"token": "completely-different-token-12345"}
+    )
+    
+    # Verify rejection
+    assert response.status_code == 401, "Should reject invalid token"
+    assert "Invalid token" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
@@ -275,34 +244,28 @@ async def test_verify_token_expired(async_client: AsyncClient, db: AsyncSession)
     - Token is cleared from database (automatic cleanup)
     
     Security: 15-minute window for magic links prevents stale links from working.
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Setup: Create user with expired token (1 minute ago)
-        user = User(email="expired@example.com")
-        user.magic_link_token = uuid4().hex
-        user.magic_link_expires_at = datetime.utcnow() - timedelta(minutes=1)
-        db.add(user)
-        await db.commit()
-        expired_token = user.magic_link_token
-        
-        # Make API request with expired token
-        response = await async_client.post(
-            "/api/auth/verify-token",
-            json={"token": expired_token}
-        )
-        
-        # Verify rejection
-        assert response.status_code == 401, "Should reject expired token"
-        assert "expired" in response.json()["detail"].lower()
-        
-        # Verify database state: expired token was cleared
-        await db.refresh(user)
-        assert user.magic_link_token is None, "Expired token should be cleared"
-        
-    except Exception as e:
-        raise e
+    # Setup: Create user with expired token (1 minute ago)
+    user = User(email="expired@example.com")
+    user.magic_link_token = uuid4().hex
+    user.magic_link_expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db.add(user)
+    await db.commit()
+    expired_token = user.magic_link_token
+    
+    # Make API request with expired token
+    response = await async_client.post(
+        "/api/auth/verify-token",
+        json={"token": expired_token}
+    )
+    
+    # Verify rejection
+    assert response.status_code == 401, "Should reject expired token"
+    assert "expired" in response.json()["detail"].lower()
+    
+    # Verify database state: expired token was cleared
+    await db.refresh(user)
+    assert user.magic_link_token is None, "Expired token should be cleared"
 
 
 @pytest.mark.asyncio
@@ -321,21 +284,15 @@ async def test_request_magic_link_invalid_email(async_client: AsyncClient):
     - Invalid emails are rejected with 422
     
     Pydantic EmailStr validates format: must have @ symbol, domain, etc.
-    
-    Cleanup: Automatic via db fixture (try/finally)
     """
-    try:
-        # Make API request with malformed email
-        response = await async_client.post(
-            "/api/auth/request-magic-link",
-            json={"email": "not-an-email"}
-        )
-        
-        # Verify validation rejection
-        assert response.status_code == 422, "Should reject invalid email format"
-        
-    except Exception as e:
-        raise e
+    # Make API request with malformed email
+    response = await async_client.post(
+        "/api/auth/request-magic-link",
+        json={"email": "not-an-email"}
+    )
+    
+    # Verify validation rejection
+    assert response.status_code == 422, "Should reject invalid email format"
 
 
 @pytest.mark.asyncio
@@ -352,20 +309,14 @@ async def test_logout_clears_cookie(client: AsyncClient, test_user: User):
     Verifies:
     - Logout endpoint is accessible to authenticated users
     - Cookie is properly cleared
-    
-    Cleanup: Automatic via db fixture
     """
-    try:
-        # Verify user is authenticated (cookie is set)
-        assert "auth_token" in client.cookies
-        
-        # Make logout request
-        response = await client.post("/api/auth/logout")
-        
-        # Verify success
-        assert response.status_code == 200
-        data = response.json()
-        assert "logged out" in data["message"].lower()
-        
-    except Exception as e:
-        raise e
+    # Verify user is authenticated (cookie is set)
+    assert "auth_token" in client.cookies
+    
+    # Make logout request
+    response = await client.post("/api/auth/logout")
+    
+    # Verify success
+    assert response.status_code == 200
+    data = response.json()
+    assert "logged out" in data["message"].lower()
@@ -0,0 +1,26 @@
+"""
+Tests for the state machine's pure transition rules.
+
+These never touch the database, so they take no db/task fixtures
+(see test_state_machine.py for transitions on persisted tasks).
+"""
+import pytest
+
+from app.models.application_task import TaskState
+from app.services.state_machine import can_transition
+
+
+@pytest.mark.asyncio
+async def test_can_transition_valid():
+    """Test can_transition returns True for valid transitions"""
+    assert await can_transition(TaskState.QUEUED, TaskState.RUNNING) is True
+    assert await can_transition(TaskState.RUNNING, TaskState.NEEDS_AUTH) is True
+    assert await can_transition(TaskState.NEEDS_AUTH, TaskState.QUEUED) is True
+
+
+@pytest.mark.asyncio
+async def test_can_transition_invalid():
+    """Test can_transition returns False for invalid transitions"""
+    assert await can_transition(TaskState.QUEUED, TaskState.SUBMITTED) is False
+    assert await can_transition(TaskState.SUBMITTED, TaskState.QUEUED) is False
+    assert await can_transition(TaskState.EXPIRED, TaskState.RUNNING) is False
@@ -1,27 +1,98 @@
 """
 Tests for Tasks API endpoints.
 """
+import itertools
+from typing import NamedTuple
+from uuid import UUID, uuid4
+
 import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+from sqlalchemy import String, cast, insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.tasks import list_tasks
 from app.models.application_task import ApplicationTask
 from app.models.application_run import ApplicationRun
 from app.models.job_posting import JobPosting
 from app.models.user import User
+from app.database_types import GUID
+from tests.helpers.asgi import CallApi
+from tests.helpers.endpoints import ApiRaw
+
+
+TASKS_URL = "/api/tasks/"
+
+# All helper-created jobs belong to one fake company (unique per company+external id)
+TEST_COMPANY_ID = uuid4()
+
+# Batch numbers keep URLs unique when a test creates jobs more than once
+_job_batches = itertools.count(1)
+
+
+# Helpers to create unique jobs
+async def create_jobs(db: AsyncSession, n: int) -> list[int]:
+    """
+    Create n unique jobs and return their IDs in order.
+    
+    The rows come from a recursive CTE (1..n) in a single
+    INSERT ... SELECT, so no per-row values are built in Python.
+    """
+    # The CTE's anchor row always exists, so n=0 would still insert one job
+    if n < 1:
+        return []
+    batch = next(_job_batches)
+    numbers = select(literal(1).label("i")).cte("numbers", recursive=True)
+    numbers = numbers.union_all(
+        select(numbers.c.i + 1).where(numbers.c.i < n)
+    )
+    suffix = literal(f"{batch}-", String) + cast(numbers.c.i, String)
+    result = await db.execute(
+        insert(JobPosting)
+        .from_select(
+            ["company_id", "external_job_id", "job_url", "apply_url"],
+            select(
+                literal(TEST_COMPANY_ID, GUID),
+                literal("job-", String) + suffix,
+                literal("https://example.com/job/", String) + suffix,
+                literal("https://example.com/apply/", String) + suffix,
+            ),
+        )
+        .returning(JobPosting.id)
+    )
+    return sorted(result.scalars().all())
 
 
-# Helper to create unique jobs
-async def create_job(db: AsyncSession, index: int = 1) -> JobPosting:
-    """Create a unique job posting for testing."""
-    job = JobPosting(
-        job_url=f"https://example.com/job/{index}",
-        apply_url=f"https://example.com/apply/{index}"
+async def create_run(db: AsyncSession, user_id: UUID) -> UUID:
+    """Create a running run for the user (one INSERT ... RETURNING)."""
+    result = await db.execute(
+        insert(ApplicationRun)
+        .values(user_id=user_id, status="running")
+        .returning(ApplicationRun.id)
     )
-    db.add(job)
-    await db.commit()
-    await db.refresh(job)
-    return job
+    return result.scalar_one()
+
+
+async def create_queued_tasks(db: AsyncSession, run_id, n: int) -> None:
+    """Create n jobs and one QUEUED task per job in the run (one INSERT per table)."""
+    job_ids = await create_jobs(db, n)
+    await db.execute(
+        insert(ApplicationTask),
+        [{"run_id": run_id, "job_id": job_id, "state": "QUEUED"} for job_id in job_ids],
+    )
+
+
+class Seeded(NamedTuple):
+    """IDs of the running run and jobs every task test starts from."""
+    run_id: UUID
+    job_ids: list[int]
+
+
+@pytest_asyncio.fixture
+async def seeded(db: AsyncSession, test_user: User) -> Seeded:
+    """A running run for test_user plus 3 jobs, rolled back with the test."""
+    run_id = await create_run(db, test_user.id)
+    job_ids = await create_jobs(db, 3)
+    return Seeded(run_id=run_id, job_ids=job_ids)
 
 
 # ============================================================
@@ -29,309 +100,239 @@ async def create_job(db: AsyncSession, index: int = 1) -> JobPosting:
 # ============================================================
 
 @pytest.mark.asyncio
-async def test_list_tasks_empty(client: AsyncClient, test_user: User):
+async def test_list_tasks_empty(call_api: CallApi, test_user: User):
     """Test listing tasks when none exist."""
-    response = await client.get("/api/tasks/")
+    response = await call_api("GET", TASKS_URL)
     
     assert response.status_code == 200
     assert response.json() == []
 
 
 @pytest.mark.asyncio
-async def test_list_tasks(client: AsyncClient, test_user: User, db: AsyncSession):
+async def test_list_tasks(api_raw: ApiRaw, db: AsyncSession, seeded: Seeded):
     """Test listing all tasks."""
-    # Create run
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    await db.commit()
-    await db.refresh(run)
-    
-    # Create tasks with different jobs (UNIQUE constraint on run_id+job_id)
-    job1 = await create_job(db, 1)
-    job2 = await create_job(db, 2)
+    # Tasks need different jobs (UNIQUE constraint on run_id+job_id)
+    job1_id, job2_id, _ = seeded.job_ids
     
     tasks = [
         ApplicationTask(
-            run_id=str(run.id),
-            job_id=job1.id,
+            run_id=seeded.run_id,
+            job_id=job1_id,
             state="QUEUED",
             priority=50
         ),
         ApplicationTask(
-            run_id=str(run.id),
-            job_id=job2.id,
+            run_id=seeded.run_id,
+            job_id=job2_id,
             state="RUNNING",
             priority=50
         ),
     ]
     db.add_all(tasks)
-    await db.commit()
+    await db.flush()
     
-    response = await client.get("/api/tasks/")
+    tasks = await api_raw(list_tasks)
     
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 2
+    assert len(tasks) == 2
 
 
 @pytest.mark.asyncio
 async def test_list_tasks_filter_by_run_id(
-    client: AsyncClient,
+    api_raw: ApiRaw,
     test_user: User,
-    db: AsyncSession
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test filtering tasks by run_id."""
-    # Create two runs
-    run1 = ApplicationRun(user_id=str(test_user.id), status="running")
-    run2 = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add_all([run1, run2])
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run1)
-    await db.refresh(run2)
-    await db.refresh(job)
-    
-    # Create tasks for both runs
-    task1 = ApplicationTask(run_id=str(run1.id), job_id=job.id, state="QUEUED")
-    task2 = ApplicationTask(run_id=str(run2.id), job_id=job.id, state="QUEUED")
+    other_run = ApplicationRun(user_id=test_user.id, status="running")
+    job_id = seeded.job_ids[0]
+    
+    # Create tasks for both runs (the flush inserts other_run first)
+    task1 = ApplicationTask(run_id=seeded.run_id, job_id=job_id, state="QUEUED")
+    task2 = ApplicationTask(run=other_run, job_id=job_id, state="QUEUED")
     db.add_all([task1, task2])
-    await db.commit()
+    await db.flush()
     
-    # Filter by run1
-    response = await client.get(f"/api/tasks/?run_id={run1.id}")
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 1
-    assert data[0]["run_id"] == str(run1.id)
+    # Filter by the seeded run
+    tasks = await api_raw(list_tasks, run_id=str(seeded.run_id))
+    assert len(tasks) == 1
+    assert tasks[0].run_id == seeded.run_id
 
 
 @pytest.mark.asyncio
 async def test_list_tasks_filter_by_state(
-    client: AsyncClient,
-    test_user: User,
-    db: AsyncSession
+    api_raw: ApiRaw,
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test filtering tasks by state."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    await db.commit()
-    await db.refresh(run)
-    
     # Create tasks with different states (need different jobs for UNIQUE constraint)
-    job1 = await create_job(db, 1)
-    job2 = await create_job(db, 2)
-    job3 = await create_job(db, 3)
+    job1_id, job2_id, job3_id = seeded.job_ids
     
     tasks = [
-        ApplicationTask(run_id=str(run.id), job_id=job1.id, state="QUEUED"),
-        ApplicationTask(run_id=str(run.id), job_id=job2.id, state="FAILED"),
-        ApplicationTask(run_id=str(run.id), job_id=job3.id, state="QUEUED"),
+        ApplicationTask(run_id=seeded.run_id, job_id=job1_id, state="QUEUED"),
+        ApplicationTask(run_id=seeded.run_id, job_id=job2_id, state="FAILED"),
+        ApplicationTask(run_id=seeded.run_id, job_id=job3_id, state="QUEUED"),
     ]
     db.add_all(tasks)
-    await db.commit()
+    await db.flush()
     
     # Filter by QUEUED
-    response = await client.get("/api/tasks/?state=QUEUED")
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 2
-    assert all(t["state"] == "QUEUED" for t in data)
+    tasks = await api_raw(list_tasks, state="QUEUED")
+    assert len(tasks) == 2
+    assert all(t.state == "QUEUED" for t in tasks)
     
     # Filter by FAILED
-    response = await client.get("/api/tasks/?state=FAILED")
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 1
-    assert data[0]["state"] == "FAILED"
+    tasks = await api_raw(list_tasks, state="FAILED")
+    assert len(tasks) == 1
+    assert tasks[0].state == "FAILED"
 
 
 @pytest.mark.asyncio
 async def test_list_tasks_filter_by_job_id(
-    client: AsyncClient,
-    test_user: User,
-    db: AsyncSession
+    api_raw: ApiRaw,
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test filtering tasks by job_id."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    # Create two jobs
-    job1 = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    job2 = JobPosting(
-        job_url="https://example.com/job/2",
-        apply_url="https://example.com/apply/2"
-    )
-    db.add_all([job1, job2])
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job1)
-    await db.refresh(job2)
+    job1_id, job2_id, _ = seeded.job_ids
     
     # Create tasks for both jobs
-    task1 = ApplicationTask(run_id=str(run.id), job_id=job1.id, state="QUEUED")
-    task2 = ApplicationTask(run_id=str(run.id), job_id=job2.id, state="QUEUED")
+    task1 = ApplicationTask(run_id=seeded.run_id, job_id=job1_id, state="QUEUED")
+    task2 = ApplicationTask(run_id=seeded.run_id, job_id=job2_id, state="QUEUED")
     db.add_all([task1, task2])
-    await db.commit()
+    await db.flush()
     
     # Filter by job1
-    response = await client.get(f"/api/tasks/?job_id={job1.id}")
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 1
-    assert data[0]["job_id"] == job1.id
+    tasks = await api_raw(list_tasks, job_id=job1_id)
+    assert len(tasks) == 1
+    assert tasks[0].job_id == job1_id
 
 
 @pytest.mark.asyncio
 async def test_list_tasks_multiple_filters_combined(
-    client: AsyncClient,
+    call_api: CallApi,
     test_user: User,
-    db: AsyncSession
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test combining multiple filters (run_id + state + job_id)."""
-    run1 = ApplicationRun(user_id=str(test_user.id), status="running")
-    run2 = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add_all([run1, run2])
+    other_run = ApplicationRun(user_id=test_user.id, status="running")
     
-    job1 = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    job2 = JobPosting(
-        job_url="https://example.com/job/2",
-        apply_url="https://example.com/apply/2"
-    )
-    db.add_all([job1, job2])
-    await db.commit()
-    await db.refresh(run1)
-    await db.refresh(run2)
-    await db.refresh(job1)
-    await db.refresh(job2)
-    
-    # Create tasks with different combinations (need different jobs for UNIQUE constraint)
-    job3 = JobPosting(job_url="https://example.com/job/3", apply_url="https://example.com/apply/3")
-    db.add(job3)
-    await db.commit()
-    await db.refresh(job3)
+    # Need different jobs for UNIQUE constraint (run_id+job_id)
+    job1_id, job2_id, job3_id = seeded.job_ids
+    
+    run_id = seeded.run_id
     
+    # Create tasks with different combinations
     tasks = [
-        ApplicationTask(run_id=str(run1.id), job_id=job1.id, state="QUEUED"),
-        ApplicationTask(run_id=str(run1.id), job_id=job3.id, state="FAILED"),  # Different job for same run
-        ApplicationTask(run_id=str(run1.id), job_id=job2.id, state="QUEUED"),
-        ApplicationTask(run_id=str(run2.id), job_id=job1.id, state="QUEUED"),
+        ApplicationTask(run_id=run_id, job_id=job1_id, state="QUEUED"),
+        ApplicationTask(run_id=run_id, job_id=job3_id, state="FAILED"),  # Different job for same run
+        ApplicationTask(run_id=run_id, job_id=job2_id, state="QUEUED"),
+        ApplicationTask(run=other_run, job_id=job1_id, state="QUEUED"),
     ]
-    db.add_all(tasks)
-    await db.commit()
-    
-    # Filter: run1 + job1 + QUEUED
-    response = await client.get(
-        f"/api/tasks/?run_id={run1.id}&job_id={job1.id}&state=QUEUED"
+    db.add_all(tasks)  # other_run is cascaded in and inserted by the same flush
+    await db.flush()
+    
+    # Filter: seeded run + job1 + QUEUED (sent as a real query string, so
+    # the query parameter parsing is covered too)
+    run_id_str = str(run_id)
+    response = await call_api(
+        "GET", TASKS_URL, params={"run_id": run_id_str, "job_id": job1_id, "state": "QUEUED"}
     )
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
-    assert data[0]["run_id"] == str(run1.id)
-    assert data[0]["job_id"] == job1.id
+    assert data[0]["run_id"] == run_id_str
+    assert data[0]["job_id"] == job1_id
     assert data[0]["state"] == "QUEUED"
 
 
 @pytest.mark.asyncio
 async def test_list_tasks_ordered_by_priority_and_time(
-    client: AsyncClient,
-    test_user: User,
-    db: AsyncSession
+    api_raw: ApiRaw,
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test that tasks are ordered by priority DESC, queued_at ASC."""
     from datetime import datetime, timedelta
     
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    await db.commit()
-    await db.refresh(run)
-    
     # Create tasks with different priorities and times (need different jobs)
     base_time = datetime.utcnow()
-    job1 = await create_job(db, 1)
-    job2 = await create_job(db, 2)
-    job3 = await create_job(db, 3)
+    job1_id, job2_id, job3_id = seeded.job_ids
     
     tasks = [
         ApplicationTask(
-            run_id=str(run.id),
-            job_id=job1.id,
+            run_id=seeded.run_id,
+            job_id=job1_id,
             state="QUEUED",
             priority=50,
             queued_at=base_time + timedelta(seconds=2)
         ),
         ApplicationTask(
-            run_id=str(run.id),
-            job_id=job2.id,
+            run_id=seeded.run_id,
+            job_id=job2_id,
             state="QUEUED",
             priority=100,  # Highest priority
             queued_at=base_time + timedelta(seconds=1)
         ),
         ApplicationTask(
-            run_id=str(run.id),
-            job_id=job3.id,
+            run_id=seeded.run_id,
+            job_id=job3_id,
             state="QUEUED",
             priority=50,
             queued_at=base_time  # Oldest with priority=50
         ),
     ]
     db.add_all(tasks)
-    await db.commit()
+    await db.flush()
     task_ids = [t.id for t in tasks]
     
-    response = await client.get("/api/tasks/")
-    assert response.status_code == 200
-    data = response.json()
+    listed = await api_raw(list_tasks)
     
     # Expected order: priority=100 first, then priority=50 (oldest first)
-    assert data[0]["id"] == str(task_ids[1])  # priority=100
-    assert data[1]["id"] == str(task_ids[2])  # priority=50, oldest
-    assert data[2]["id"] == str(task_ids[0])  # priority=50, newest
+    assert listed[0].id == task_ids[1]  # priority=100
+    assert listed[1].id == task_ids[2]  # priority=50, oldest
+    assert listed[2].id == task_ids[0]  # priority=50, newest
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_single_query(
+    call_api: CallApi,
+    db: AsyncSession,
+    seeded: Seeded,
+    count_queries: list[str]
+):
+    """Test listing tasks issues one task SELECT regardless of page size (no N+1)."""
+    await create_queued_tasks(db, seeded.run_id, 10)
+    
+    count_queries.clear()
+    response = await call_api("GET", TASKS_URL)
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    task_queries = [q for q in count_queries if "FROM application_tasks" in q]
+    assert len(task_queries) == 1
 
 
 @pytest.mark.asyncio
 async def test_list_tasks_pagination(
-    client: AsyncClient,
-    test_user: User,
-    db: AsyncSession
+    api_raw: ApiRaw,
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test pagination with skip and limit."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    await db.commit()
-    await db.refresh(run)
-    
     # Create 10 tasks with different jobs
-    for i in range(10):
-        job = await create_job(db, i + 1)
-        task = ApplicationTask(run_id=str(run.id), job_id=job.id, state="QUEUED")
-        db.add(task)
-    await db.commit()
+    await create_queued_tasks(db, seeded.run_id, 10)
     
     # Get first 3
-    response = await client.get("/api/tasks/?skip=0&limit=3")
-    assert response.status_code == 200
-    assert len(response.json()) == 3
+    assert len(await api_raw(list_tasks, skip=0, limit=3)) == 3
     
     # Get next 3
-    response = await client.get("/api/tasks/?skip=3&limit=3")
-    assert response.status_code == 200
-    assert len(response.json()) == 3
+    assert len(await api_raw(list_tasks, skip=3, limit=3)) == 3
     
     # Get last 4
-    response = await client.get("/api/tasks/?skip=6&limit=10")
-    assert response.status_code == 200
-    assert len(response.json()) == 4
+    assert len(await api_raw(list_tasks, skip=6, limit=10)) == 4
 
 
 # ============================================================
@@ -339,26 +340,13 @@ async def test_list_tasks_pagination(
 # ============================================================
 
 @pytest.mark.asyncio
-async def test_get_task(client: AsyncClient, test_user: User, db: AsyncSession):
+async def test_get_task(call_api: CallApi, db: AsyncSession, seeded: Seeded):
     """Test getting a specific task by ID."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    task = ApplicationTask(run_id=str(run.id), job_id=job.id, state="QUEUED")
+    task = ApplicationTask(run_id=seeded.run_id, job_id=seeded.job_ids[0], state="QUEUED")
     db.add(task)
-    await db.commit()
-    await db.refresh(task)
+    await db.flush()
     
-    response = await client.get(f"/api/tasks/{task.id}")
+    response = await call_api("GET", f"{TASKS_URL}{task.id}")
     
     assert response.status_code == 200
     data = response.json()
@@ -368,10 +356,10 @@ async def test_get_task(client: AsyncClient, test_user: User, db: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_get_task_not_found(client: AsyncClient, test_user: User):
+async def test_get_task_not_found(call_api: CallApi, test_user: User):
     """Test getting a non-existent task."""
     fake_uuid = "00000000-0000-0000-0000-000000000000"
-    response = await client.get(f"/api/tasks/{fake_uuid}")
+    response = await call_api("GET", f"{TASKS_URL}{fake_uuid}")
     
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
@@ -382,38 +370,31 @@ async def test_get_task_not_found(client: AsyncClient, test_user: User):
 # ============================================================
 
 @pytest.mark.asyncio
-async def test_resume_failed_task(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test resuming a FAILED task."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
+@pytest.mark.parametrize("state", ["FAILED", "NEEDS_AUTH", "NEEDS_USER", "EXPIRED"])
+async def test_resume_resumable_state(
+    call_api: CallApi,
+    db: AsyncSession,
+    seeded: Seeded,
+    state: str
+):
+    """Test resuming a FAILED / NEEDS_AUTH / NEEDS_USER / EXPIRED task."""
     task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="FAILED",
+        run_id=seeded.run_id,
+        job_id=seeded.job_ids[0],
+        state=state,
         priority=50,
-        last_error_message="Timeout"
+        last_error_message="Timeout" if state == "FAILED" else None
     )
     db.add(task)
-    await db.commit()
-    await db.refresh(task)
+    await db.flush()
     task_id = task.id
     
-    response = await client.post(f"/api/tasks/{task_id}/resume")
+    response = await call_api("POST", f"{TASKS_URL}{task_id}/resume")
     
     assert response.status_code == 200
     data = response.json()
     assert data["task_id"] == str(task_id)
-    assert data["old_state"] == "FAILED"
+    assert data["old_state"] == state
     assert data["new_state"] == "QUEUED"
     assert data["priority"] == 100  # Priority boost
     
@@ -424,276 +405,86 @@ async def test_resume_failed_task(client: AsyncClient, test_user: User, db: Asyn
 
 
 @pytest.mark.asyncio
-async def test_resume_needs_auth_task(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test resuming a NEEDS_AUTH task."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="NEEDS_AUTH",
-        priority=50
-    )
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    
-    response = await client.post(f"/api/tasks/{task.id}/resume")
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert data["old_state"] == "NEEDS_AUTH"
-    assert data["new_state"] == "QUEUED"
-    assert data["priority"] == 100
-
-
-@pytest.mark.asyncio
-async def test_resume_needs_user_task(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test resuming a NEEDS_USER task."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="NEEDS_USER",
-        priority=50
-    )
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    
-    response = await client.post(f"/api/tasks/{task.id}/resume")
-    
-    assert response.status_code == 200
-    assert response.json()["old_state"] == "NEEDS_USER"
-    assert response.json()["new_state"] == "QUEUED"
-
-
-@pytest.mark.asyncio
-async def test_resume_expired_task(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test resuming an EXPIRED task."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="EXPIRED",
-        priority=50
-    )
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    
-    response = await client.post(f"/api/tasks/{task.id}/resume")
-    
-    assert response.status_code == 200
-    assert response.json()["old_state"] == "EXPIRED"
-    assert response.json()["new_state"] == "QUEUED"
-
-
-@pytest.mark.asyncio
-async def test_resume_task_invalid_state(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test that resuming a task in non-resumable state is rejected."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    # Try to resume SUBMITTED task (not resumable)
+@pytest.mark.parametrize("state", ["SUBMITTED", "QUEUED", "RUNNING"])
+async def test_resume_non_resumable_state_rejected(
+    call_api: CallApi,
+    db: AsyncSession,
+    seeded: Seeded,
+    state: str
+):
+    """Test that resuming a task in a non-resumable state is rejected."""
     task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="SUBMITTED",
+        run_id=seeded.run_id,
+        job_id=seeded.job_ids[0],
+        state=state,
         priority=50
     )
     db.add(task)
-    await db.commit()
-    await db.refresh(task)
+    await db.flush()
     
-    response = await client.post(f"/api/tasks/{task.id}/resume")
+    response = await call_api("POST", f"{TASKS_URL}{task.id}/resume")
     
     assert response.status_code == 409
-    assert "Cannot resume task in state SUBMITTED" in response.json()["detail"]
+    assert f"Cannot resume task in state {state}" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
-async def test_resume_task_not_found(client: AsyncClient, test_user: User):
+async def test_resume_task_not_found(call_api: CallApi, test_user: User):
     """Test resuming a non-existent task."""
     fake_uuid = "00000000-0000-0000-0000-000000000000"
-    response = await client.post(f"/api/tasks/{fake_uuid}/resume")
+    response = await call_api("POST", f"{TASKS_URL}{fake_uuid}/resume")
     
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
 
-@pytest.mark.asyncio
-async def test_resume_queued_task_rejected(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test that resuming a QUEUED task is rejected (already ready)."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="QUEUED",
-        priority=50
-    )
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    
-    response = await client.post(f"/api/tasks/{task.id}/resume")
-    
-    assert response.status_code == 409
-    assert "Cannot resume" in response.json()["detail"]
-
-
-@pytest.mark.asyncio
-async def test_resume_running_task_rejected(client: AsyncClient, test_user: User, db: AsyncSession):
-    """Test that resuming a RUNNING task is rejected (currently processing)."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
-    task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
-        state="RUNNING",
-        priority=50
-    )
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    
-    response = await client.post(f"/api/tasks/{task.id}/resume")
-    
-    assert response.status_code == 409
-    assert "Cannot resume" in response.json()["detail"]
-
-
 # ============================================================
 # EDGE CASES & VALIDATION
 # ============================================================
 
 @pytest.mark.asyncio
 async def test_list_tasks_pagination_boundaries(
-    client: AsyncClient,
-    test_user: User,
-    db: AsyncSession
+    call_api: CallApi,
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test pagination edge cases."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    await db.commit()
-    await db.refresh(run)
-    
     # Create 5 tasks with different jobs
-    for i in range(5):
-        job = await create_job(db, i + 1)
-        task = ApplicationTask(run_id=str(run.id), job_id=job.id, state="QUEUED")
-        db.add(task)
-    await db.commit()
+    await create_queued_tasks(db, seeded.run_id, 5)
     
     # Skip beyond available
-    response = await client.get("/api/tasks/?skip=100")
+    response = await call_api("GET", TASKS_URL, params={"skip": 100})
     assert response.status_code == 200
     assert len(response.json()) == 0
     
     # Limit at max (100)
-    response = await client.get("/api/tasks/?limit=100")
+    response = await call_api("GET", TASKS_URL, params={"limit": 100})
     assert response.status_code == 200
     assert len(response.json()) == 5
     
     # Invalid limit (> 100) should be rejected
-    response = await client.get("/api/tasks/?limit=101")
+    response = await call_api("GET", TASKS_URL, params={"limit": 101})
     assert response.status_code == 422
 
 
 @pytest.mark.asyncio
 async def test_task_response_structure(
-    client: AsyncClient,
-    test_user: User,
-    db: AsyncSession
+    call_api: CallApi,
+    db: AsyncSession,
+    seeded: Seeded
 ):
     """Test that task response contains all expected fields."""
-    run = ApplicationRun(user_id=str(test_user.id), status="running")
-    db.add(run)
-    
-    job = JobPosting(
-        job_url="https://example.com/job/1",
-        apply_url="https://example.com/apply/1"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(run)
-    await db.refresh(job)
-    
     task = ApplicationTask(
-        run_id=str(run.id),
-        job_id=job.id,
+        run_id=seeded.run_id,
+        job_id=seeded.job_ids[0],
         state="FAILED",
         last_error_code="TIMEOUT",
         last_error_message="Request timed out"
     )
     db.add(task)
-    await db.commit()
-    await db.refresh(task)
+    await db.flush()
     
-    response = await client.get(f"/api/tasks/{task.id}")
+    response = await call_api("GET", f"{TASKS_URL}{task.id}")
     assert response.status_code == 200
     data = response.json()
     